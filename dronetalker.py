@@ -1,233 +1,514 @@
-from flask import Flask, request, jsonify
-from flask_cors import CORS
-import sqlite3
-import time
-import os
-import logging
-
-# --------------------
-# CONFIG
-# --------------------
-APP_TOKEN = os.environ.get("APP_TOKEN", "CHANGE_ME")
-DB_PATH = os.environ.get("DB_PATH", "targets.db")
-MAX_AGE_SECONDS = int(os.environ.get("MAX_AGE_SECONDS", "60"))
-MAX_ACCURACY_M = float(os.environ.get("MAX_ACCURACY_M", "50"))
-
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s | %(levelname)s | %(message)s",
-    force=True
-)
-log = logging.getLogger("dronetalker")
-
-app = Flask(__name__)
-CORS(app)
-
-# --------------------
-# DATABASE
-# --------------------
-def init_db():
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
-    
-    # 1. Target Table (Existing)
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS latest_target (
-            id INTEGER PRIMARY KEY CHECK (id = 1),
-            lat REAL, lon REAL, accuracy REAL,
-            created_at INTEGER, request_id TEXT
-        )
-    """)
-    cur.execute("""
-        INSERT OR IGNORE INTO latest_target
-        (id, lat, lon, accuracy, created_at, request_id)
-        VALUES (1, NULL, NULL, NULL, NULL, NULL)
-    """)
-
-    # 2. Command Table (New - for RTH/Hover)
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS command_buffer (
-            id INTEGER PRIMARY KEY CHECK (id = 1),
-            command TEXT,
-            created_at INTEGER
-        )
-    """)
-    cur.execute("""
-        INSERT OR IGNORE INTO command_buffer (id, command, created_at)
-        VALUES (1, "NONE", 0)
-    """)
-
-    # 3. Logs Table (New - for Drone Status)
-    # We only keep the last 50 logs to keep it light
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS drone_logs (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            message TEXT,
-            created_at INTEGER
-        )
-    """)
-
-    conn.commit()
-    conn.close()
-    log.info("Database initialised with Target, Command, and Log tables")
-
-# --- DB HELPERS ---
-
-def add_log_entry(message):
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
-    cur.execute("INSERT INTO drone_logs (message, created_at) VALUES (?, ?)", (message, int(time.time())))
-    # Cleanup old logs (keep last 50)
-    cur.execute("DELETE FROM drone_logs WHERE id NOT IN (SELECT id FROM drone_logs ORDER BY id DESC LIMIT 50)")
-    conn.commit()
-    conn.close()
-
-def get_recent_logs(limit=10):
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
-    cur.execute("SELECT message, created_at FROM drone_logs ORDER BY id DESC LIMIT ?", (limit,))
-    rows = cur.fetchall()
-    conn.close()
-    return [{"message": r[0], "time": r[1]} for r in rows]
-
-def set_command(cmd):
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
-    cur.execute("UPDATE command_buffer SET command = ?, created_at = ? WHERE id = 1", (cmd, int(time.time())))
-    conn.commit()
-    conn.close()
-
-def get_current_command():
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
-    cur.execute("SELECT command, created_at FROM command_buffer WHERE id = 1")
-    row = cur.fetchone()
-    conn.close()
-    if row and row[0] != "NONE":
-        # Check if command is stale (e.g., older than 10 seconds)
-        if (int(time.time()) - row[1]) < 10:
-            return row[0]
-    return None
-
-def set_latest_target(lat, lon, accuracy, request_id):
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
-    cur.execute("""
-        UPDATE latest_target
-        SET lat = ?, lon = ?, accuracy = ?, created_at = ?, request_id = ?
-        WHERE id = 1
-    """, (lat, lon, accuracy, int(time.time()), request_id))
-    conn.commit()
-    conn.close()
-
-def get_latest_target():
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
-    cur.execute("SELECT lat, lon, accuracy, created_at, request_id FROM latest_target WHERE id = 1")
-    row = cur.fetchone()
-    conn.close()
-    if not row or row[0] is None: return None
-    return {"lat": row[0], "lon": row[1], "accuracy": row[2], "created_at": row[3], "request_id": row[4]}
-
-# --------------------
-# ROUTES
-# --------------------
-@app.route("/", methods=["GET"])
-def root():
-    return jsonify({"ok": True, "service": "dronetalker"})
-
-# --- 1. TARGET ROUTES (Existing) ---
-
-@app.route("/go", methods=["POST"])
-def go():
-    token = request.headers.get("X-APP-TOKEN", "")
-    if token != APP_TOKEN: return jsonify({"ok": False, "error": "unauthorized"}), 401
-    
-    data = request.get_json(silent=True) or {}
-    try:
-        lat, lon = float(data.get("lat")), float(data.get("lon"))
-        acc = float(data.get("accuracy"))
-        rid = str(data.get("request_id"))
-    except: return jsonify({"ok": False, "error": "invalid data"}), 400
-
-    if acc > MAX_ACCURACY_M: return jsonify({"ok": False, "error": f"gps poor ({acc:.1f}m)"}), 400
-
-    log.info(f"TARGET | lat={lat} lon={lon}")
-    set_latest_target(lat, lon, acc, rid)
-    # Log this action to the drone log as well
-    add_log_entry(f"New Target Received: {lat:.5f}, {lon:.5f}")
-    
-    return jsonify({"ok": True})
-
-@app.route("/latest", methods=["GET"])
-def latest():
-    token = request.headers.get("X-APP-TOKEN", "")
-    if token != APP_TOKEN: return jsonify({"ok": False, "error": "unauthorized"}), 401
-    
-    tgt = get_latest_target()
-    if not tgt: return jsonify({"ok": False, "error": "no target"}), 404
-    
-    age = int(time.time()) - int(tgt["created_at"])
-    if age > MAX_AGE_SECONDS: return jsonify({"ok": False, "error": "target stale"}), 410
-    
-    return jsonify({"ok": True, "target": tgt, "age_seconds": age})
-
-# --- 2. COMMAND ROUTES (New: Hover / RTH) ---
-
-@app.route("/drone/cmd", methods=["POST"])
-def post_command():
-    # Web App calls this
-    token = request.headers.get("X-APP-TOKEN", "")
-    if token != APP_TOKEN: return jsonify({"ok": False, "error": "unauthorized"}), 401
-    
-    data = request.get_json(silent=True) or {}
-    cmd = data.get("command") # "HOVER" or "RTH" or "LAND"
-    
-    if cmd not in ["HOVER", "RTH", "LAND"]:
-        return jsonify({"ok": False, "error": "invalid command"}), 400
-
-    set_command(cmd)
-    add_log_entry(f"Command Sent: {cmd}")
-    log.info(f"COMMAND | {cmd}")
-    return jsonify({"ok": True, "command": cmd})
-
-@app.route("/drone/cmd", methods=["GET"])
-def get_command():
-    # Android Drone calls this to check for instructions
-    token = request.headers.get("X-APP-TOKEN", "")
-    if token != APP_TOKEN: return jsonify({"ok": False, "error": "unauthorized"}), 401
-    
-    cmd = get_current_command()
-    if not cmd:
-        return jsonify({"ok": True, "command": None})
-    
-    return jsonify({"ok": True, "command": cmd})
-
-# --- 3. STATUS LOG ROUTES (New: Drone Updates) ---
-
-@app.route("/drone/status", methods=["POST"])
-def post_status():
-    # Android Drone calls this to report status
-    token = request.headers.get("X-APP-TOKEN", "")
-    if token != APP_TOKEN: return jsonify({"ok": False, "error": "unauthorized"}), 401
-    
-    data = request.get_json(silent=True) or {}
-    msg = data.get("message")
-    
-    if msg:
-        add_log_entry(msg)
-        log.info(f"DRONE STATUS | {msg}")
-    
-    return jsonify({"ok": True})
-
-@app.route("/drone/status", methods=["GET"])
-def get_status():
-    # Web App calls this to show the feed
-    # No auth needed strictly for read-only logs if you prefer, 
-    # but let's keep it safe.
-    logs = get_recent_logs(limit=20)
-    return jsonify({"ok": True, "logs": logs})
-
-if __name__ == "__main__":
-    init_db()
-    app.run(host="0.0.0.0", port=5000)
\ No newline at end of file
+from flask import Flask, request, jsonify, g, Response
+from flask.json.provider import JSONProvider
+from contextlib import contextmanager
+import msgspec
+import orjson
+import itertools
+import hmac
+import sqlite3
+import queue
+import threading
+import time
+import os
+import sys
+import logging
+from logging.handlers import QueueHandler, QueueListener
+
+# --------------------
+# CONFIG
+# --------------------
+APP_TOKEN = os.environ.get("APP_TOKEN", "CHANGE_ME")
+APP_TOKEN_B = APP_TOKEN.encode()
+DB_PATH = os.environ.get("DB_PATH", "targets.db")
+MAX_AGE_SECONDS = int(os.environ.get("MAX_AGE_SECONDS", "60"))
+MAX_ACCURACY_M = float(os.environ.get("MAX_ACCURACY_M", "50"))
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "8"))
+CMD_POLL_TIMEOUT = float(os.environ.get("CMD_POLL_TIMEOUT", "25"))
+
+# Request threads only enqueue log records; a QueueListener thread
+# does the actual stderr writes so handlers never block on the pipe.
+# LOG_LEVEL=WARNING in production silences the per-request lines.
+_stderr_handler = logging.StreamHandler(sys.stderr)
+_stderr_handler.setFormatter(logging.Formatter("%(asctime)s | %(levelname)s | %(message)s"))
+_root = logging.getLogger()
+_root.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
+_root.handlers = [QueueHandler(queue.Queue(-1))]
+_log_listener = QueueListener(_root.handlers[0].queue, _stderr_handler)
+_log_listener.start()
+log = logging.getLogger("dronetalker")
+
+app = Flask(__name__)
+
+# orjson (C implementation) for all request/response JSON — several
+# times faster than stdlib json on the small dicts jsonify returns
+class ORJSONProvider(JSONProvider):
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+app.json = ORJSONProvider(app)
+
+# Hand-rolled CORS: we only ever need wildcard-origin access for a
+# fixed set of methods/headers, so three static headers per response
+# beat flask_cors inspecting every request through Werkzeug hooks.
+@app.after_request
+def add_cors_headers(resp):
+    resp.headers["Access-Control-Allow-Origin"] = "*"
+    resp.headers["Access-Control-Allow-Headers"] = "X-APP-TOKEN,Content-Type"
+    resp.headers["Access-Control-Allow-Methods"] = "GET,POST,OPTIONS"
+    return resp
+
+@app.route("/<path:_unused>", methods=["OPTIONS"])
+def cors_preflight(_unused):
+    # Browser preflight; headers come from add_cors_headers
+    return "", 204
+
+# Endpoints that require the app token. Auth lives in one
+# before_request guard instead of being duplicated per handler, and
+# compare_digest keeps the comparison constant-time.
+PROTECTED_ENDPOINTS = frozenset({"go", "latest", "post_command", "get_command", "post_status"})
+
+@app.before_request
+def stamp_request():
+    # One clock read per request; handlers and DB helpers reuse g.now
+    g.now = int(time.time())
+
+@app.before_request
+def check_token():
+    # Preflights carry no custom headers, so OPTIONS is always exempt
+    if request.method == "OPTIONS" or request.endpoint not in PROTECTED_ENDPOINTS:
+        return None
+    token = request.headers.get("X-APP-TOKEN", "")
+    if not hmac.compare_digest(token.encode(), APP_TOKEN_B):
+        return jsonify({"ok": False, "error": "unauthorized"}), 401
+
+# --------------------
+# DATABASE
+# --------------------
+
+# drone_logs is a fixed-size ring buffer: 50 preallocated slots that
+# writers overwrite in round-robin order. Constant table size, no
+# cleanup DELETE, no AUTOINCREMENT bookkeeping.
+LOG_RING_SIZE = 50
+
+# SQL kept as module-level constants: the same string object hits
+# sqlite3's per-connection statement cache, so SQLite parses and plans
+# each query once per connection instead of once per call.
+WRITE_LOG_SQL = "UPDATE drone_logs SET message = ?, created_at = ?, seq = ? WHERE id = ?"
+# Ordering by the persisted sequence number, not created_at: the
+# timestamps are second-granularity, so once the ring wraps they tie
+# within a burst and would scramble the feed
+SELECT_LOGS_SQL = "SELECT message, created_at FROM drone_logs WHERE message IS NOT NULL ORDER BY seq DESC LIMIT ?"
+UPDATE_COMMAND_SQL = "UPDATE command_buffer SET command = ?, created_at = ? WHERE id = 1"
+SELECT_COMMAND_SQL = "SELECT command, created_at FROM command_buffer WHERE id = 1"
+UPDATE_TARGET_SQL = """
+    UPDATE latest_target
+    SET lat = ?, lon = ?, accuracy = ?, created_at = ?, request_id = ?
+    WHERE id = 1
+"""
+SELECT_TARGET_SQL = "SELECT lat, lon, accuracy, created_at, request_id FROM latest_target WHERE id = 1"
+
+def _connect():
+    # Fresh connection with the per-connection pragmas applied.
+    # WAL / mmap are database-level and persist once set in init_db.
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False, cached_statements=256)
+    conn.execute("PRAGMA busy_timeout=5000")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+# Reusable connections, created once at startup. Opening/closing a
+# connection per request costs syscalls and throws away SQLite's page
+# cache; handing the same handles around keeps everything hot.
+# Sized to match Flask's threaded server (one connection per worker).
+_pool = queue.Queue()
+
+@contextmanager
+def db():
+    conn = _pool.get()
+    try:
+        yield conn
+    finally:
+        _pool.put(conn)
+
+# Hot cache for the two singleton rows. The drone polls /latest and
+# /drone/cmd far more often than anything writes them, so reads are
+# served from memory and SQLite is only the durable write-through copy.
+# Per-worker by design: with multiple workers the DB is the source of
+# truth for crash recovery only.
+_state_lock = threading.Lock()
+_target_cache = None  # dict mirroring latest_target, or None if unset
+_cmd_cache = {"command": "NONE", "created_at": 0}
+# Signalled whenever a new command arrives, so long-polling drones
+# wake immediately instead of rediscovering it on their next interval
+_cmd_event = threading.Event()
+
+# All writes (target, command, logs) are queued here as (sql, params)
+# and flushed by a background thread, so the request path never waits
+# on a commit. A /go request's target UPDATE and its log entry land in
+# the same batch, i.e. one transaction and one fsync for both.
+_write_q = queue.Queue()
+# Round-robin slot chooser for the ring buffer (slot = seq % 50 + 1)
+_log_seq = itertools.count()
+
+def _db_writer():
+    # Autocommit connection with explicit transactions: BEGIN IMMEDIATE
+    # grabs the write lock up front instead of upgrading a deferred
+    # read transaction mid-batch, which is where SQLITE_BUSY races with
+    # other writers come from.
+    conn = _connect()
+    conn.isolation_level = None
+    while True:
+        # Block for the first op, then batch whatever else arrives
+        # within ~100 ms into a single transaction (one fsync).
+        ops = [_write_q.get()]
+        deadline = time.monotonic() + 0.1
+        while True:
+            try:
+                ops.append(_write_q.get(timeout=max(0.0, deadline - time.monotonic())))
+            except queue.Empty:
+                break
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for sql, params in ops:
+                conn.execute(sql, params)
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            # BEGIN itself can fail (e.g. SQLITE_BUSY after the busy
+            # timeout), in which case there is no transaction to roll
+            # back — and the loop must survive either way
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            log.exception("db writer batch failed (%d ops dropped)", len(ops))
+
+def init_db():
+    conn = sqlite3.connect(DB_PATH)
+    cur = conn.cursor()
+
+    # WAL mode: writers no longer block readers, and commits cost one
+    # fsync instead of two. The other pragmas keep temp data and the
+    # page cache in memory so the polling routes stay off the disk.
+    cur.execute("PRAGMA journal_mode=WAL")
+    cur.execute("PRAGMA synchronous=NORMAL")
+    cur.execute("PRAGMA temp_store=MEMORY")
+    cur.execute("PRAGMA mmap_size=30000000000")
+    cur.execute("PRAGMA cache_size=-64000")
+    cur.execute("PRAGMA busy_timeout=5000")
+
+    # Data is transient, so tables created before the current layout
+    # are simply dropped and recreated below
+    for tbl in ("latest_target", "command_buffer"):
+        row = cur.execute("SELECT sql FROM sqlite_master WHERE name = ?", (tbl,)).fetchone()
+        if row and "WITHOUT ROWID" not in row[0]:
+            cur.execute(f"DROP TABLE {tbl}")
+    # ... including a drone_logs from before the ring buffer (the old
+    # AUTOINCREMENT rows with id > 50 would otherwise linger forever
+    # and resurface in the status feed) or without the seq column
+    row = cur.execute("SELECT sql FROM sqlite_master WHERE name = 'drone_logs'").fetchone()
+    if row and ("AUTOINCREMENT" in row[0] or "seq" not in row[0]):
+        cur.execute("DROP TABLE drone_logs")
+
+    # 1. Target Table (Existing)
+    # WITHOUT ROWID: the single row lives directly in the PK B-tree,
+    # saving the rowid indirection on every read
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS latest_target (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            lat REAL, lon REAL, accuracy REAL,
+            created_at INTEGER, request_id TEXT
+        ) WITHOUT ROWID
+    """)
+    cur.execute("""
+        INSERT OR IGNORE INTO latest_target
+        (id, lat, lon, accuracy, created_at, request_id)
+        VALUES (1, NULL, NULL, NULL, NULL, NULL)
+    """)
+
+    # 2. Command Table (New - for RTH/Hover)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS command_buffer (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            command TEXT,
+            created_at INTEGER
+        ) WITHOUT ROWID
+    """)
+    cur.execute("""
+        INSERT OR IGNORE INTO command_buffer (id, command, created_at)
+        VALUES (1, "NONE", 0)
+    """)
+
+    # 3. Logs Table (New - for Drone Status)
+    # Fixed 50-slot ring buffer: seed every slot up front and let the
+    # writer overwrite them round-robin, so the table never grows
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS drone_logs (
+            id INTEGER PRIMARY KEY,
+            message TEXT,
+            created_at INTEGER,
+            seq INTEGER
+        )
+    """)
+    cur.executemany(
+        "INSERT OR IGNORE INTO drone_logs (id, message, created_at, seq) VALUES (?, NULL, NULL, NULL)",
+        [(slot,) for slot in range(1, LOG_RING_SIZE + 1)]
+    )
+    # The status feed reads newest-first by seq; a descending index
+    # lets that walk the index instead of sorting 50 rows
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_logs_seq ON drone_logs(seq DESC)")
+
+    # Resume the sequence where the last run stopped so ordering (and
+    # slot rotation) stays continuous across restarts
+    global _log_seq
+    max_seq = cur.execute("SELECT MAX(seq) FROM drone_logs").fetchone()[0]
+    _log_seq = itertools.count(0 if max_seq is None else max_seq + 1)
+
+    conn.commit()
+    conn.close()
+
+    # Populate the connection pool now that the schema exists
+    for _ in range(DB_POOL_SIZE):
+        _pool.put(_connect())
+
+    threading.Thread(target=_db_writer, daemon=True, name="db-writer").start()
+
+    # Warm the singleton caches from whatever survived the last run
+    global _target_cache
+    with db() as c:
+        row = c.execute(SELECT_TARGET_SQL).fetchone()
+        if row and row[0] is not None:
+            _target_cache = {"lat": row[0], "lon": row[1], "accuracy": row[2], "created_at": row[3], "request_id": row[4]}
+        row = c.execute(SELECT_COMMAND_SQL).fetchone()
+        if row:
+            _cmd_cache.update(command=row[0], created_at=row[1])
+
+    log.info("Database initialised with Target, Command, and Log tables")
+
+# --- DB HELPERS ---
+
+def add_log_entry(message, now):
+    # Fire-and-forget: the writer thread batches the actual writes
+    seq = next(_log_seq)
+    _write_q.put_nowait((WRITE_LOG_SQL, (message, now, seq, seq % LOG_RING_SIZE + 1)))
+
+def get_recent_logs(limit=10):
+    with db() as conn:
+        cur = conn.execute(SELECT_LOGS_SQL, (limit,))
+        rows = cur.fetchall()
+    return [{"message": r[0], "time": r[1]} for r in rows]
+
+def set_command(cmd, now):
+    with _state_lock:
+        _cmd_cache.update(command=cmd, created_at=now)
+    _write_q.put_nowait((UPDATE_COMMAND_SQL, (cmd, now)))
+    _cmd_event.set()
+
+def get_current_command(now):
+    with _state_lock:
+        cmd, created_at = _cmd_cache["command"], _cmd_cache["created_at"]
+    if cmd != "NONE":
+        # Check if command is stale (e.g., older than 10 seconds)
+        if (now - created_at) < 10:
+            return cmd
+    return None
+
+def set_latest_target(lat, lon, accuracy, request_id, now):
+    global _target_cache
+    with _state_lock:
+        _target_cache = {"lat": lat, "lon": lon, "accuracy": accuracy, "created_at": now, "request_id": request_id}
+    _write_q.put_nowait((UPDATE_TARGET_SQL, (lat, lon, accuracy, now, request_id)))
+
+def get_latest_target():
+    with _state_lock:
+        return _target_cache
+
+# --------------------
+# PAYLOADS
+# --------------------
+
+# Fixed-shape request bodies are decoded straight into msgspec Structs:
+# parse + type validation happen in one C pass, replacing
+# request.get_json() plus per-field float()/str() casts.
+class GoPayload(msgspec.Struct):
+    lat: float
+    lon: float
+    accuracy: float
+    request_id: str
+
+class CommandPayload(msgspec.Struct):
+    command: str  # "HOVER" or "RTH" or "LAND"
+
+# strict=False keeps the old float("...") leniency for clients that
+# send coordinates as strings
+_go_decoder = msgspec.json.Decoder(GoPayload, strict=False)
+_cmd_decoder = msgspec.json.Decoder(CommandPayload)
+
+# --------------------
+# ROUTES
+# --------------------
+# Built once at import: body and Response object never change, so
+# returning the same instance skips the dict build, the serialization
+# and Response.__init__ per call (Werkzeug copies headers on send, so
+# sharing the instance across requests is safe)
+ROOT_BODY = orjson.dumps({"ok": True, "service": "dronetalker"})
+_ROOT_RESP = Response(ROOT_BODY, mimetype="application/json")
+_OK_RESP = Response(b'{"ok":true}', mimetype="application/json")
+# One canned response per valid command, keyed for the POST echo
+_CMD_OK_RESPS = {
+    c: Response(orjson.dumps({"ok": True, "command": c}), mimetype="application/json")
+    for c in ("HOVER", "RTH", "LAND")
+}
+
+@app.route("/", methods=["GET"])
+def root():
+    return _ROOT_RESP
+
+# --- 1. TARGET ROUTES (Existing) ---
+
+@app.route("/go", methods=["POST"])
+def go():
+    try:
+        p = _go_decoder.decode(request.get_data(cache=False))
+    except msgspec.DecodeError:
+        return jsonify({"ok": False, "error": "invalid data"}), 400
+
+    if p.accuracy > MAX_ACCURACY_M: return jsonify({"ok": False, "error": f"gps poor ({p.accuracy:.1f}m)"}), 400
+
+    # %-style so the string is only built if the record is emitted
+    log.info("TARGET | lat=%s lon=%s", p.lat, p.lon)
+    set_latest_target(p.lat, p.lon, p.accuracy, p.request_id, g.now)
+    # Log this action to the drone log as well
+    add_log_entry(f"New Target Received: {p.lat:.5f}, {p.lon:.5f}", g.now)
+
+    return _OK_RESP
+
+@app.route("/latest", methods=["GET"])
+def latest():
+    tgt = get_latest_target()
+    if not tgt: return jsonify({"ok": False, "error": "no target"}), 404
+    
+    age = g.now - int(tgt["created_at"])
+    if age > MAX_AGE_SECONDS: return jsonify({"ok": False, "error": "target stale"}), 410
+    
+    return jsonify({"ok": True, "target": tgt, "age_seconds": age})
+
+# --- 2. COMMAND ROUTES (New: Hover / RTH) ---
+
+@app.route("/drone/cmd", methods=["POST"])
+def post_command():
+    # Web App calls this
+    try:
+        cmd = _cmd_decoder.decode(request.get_data(cache=False)).command
+    except msgspec.DecodeError:
+        return jsonify({"ok": False, "error": "invalid command"}), 400
+
+    if cmd not in ["HOVER", "RTH", "LAND"]:
+        return jsonify({"ok": False, "error": "invalid command"}), 400
+
+    set_command(cmd, g.now)
+    add_log_entry(f"Command Sent: {cmd}", g.now)
+    log.info("COMMAND | %s", cmd)
+    return _CMD_OK_RESPS[cmd]
+
+def _resolve_command(now):
+    # Long-poll: if no command is pending, hold the request open until
+    # POST /drone/cmd signals one (or the timeout lapses), so a 1 s
+    # polling loop becomes one held connection instead of ~25 requests.
+    # Clear before checking: a command posted between a check and a
+    # later clear would have its wakeup wiped and sit out the full
+    # timeout — past its 10 s staleness window, i.e. dropped entirely
+    _cmd_event.clear()
+    cmd = get_current_command(now)
+    if not cmd and _cmd_event.wait(CMD_POLL_TIMEOUT):
+        # The wall clock moved while we were parked
+        cmd = get_current_command(int(time.time()))
+    return cmd
+
+@app.route("/drone/cmd", methods=["GET"])
+def get_command():
+    # Android Drone calls this to check for instructions.
+    # Normally short-circuited by the FastPath middleware below; kept
+    # as a route so the endpoint stays visible in url_map and tests.
+    return jsonify({"ok": True, "command": _resolve_command(g.now)})
+
+# --- 3. STATUS LOG ROUTES (New: Drone Updates) ---
+
+@app.route("/drone/status", methods=["POST"])
+def post_status():
+    # Android Drone calls this to report status
+    data = request.get_json(silent=True) or {}
+    msg = data.get("message")
+    
+    if msg:
+        add_log_entry(msg, g.now)
+        log.info("DRONE STATUS | %s", msg)
+
+    return _OK_RESP
+
+@app.route("/drone/status", methods=["GET"])
+def get_status():
+    # Web App calls this to show the feed
+    # No auth needed strictly for read-only logs if you prefer, 
+    # but let's keep it safe.
+    logs = get_recent_logs(limit=20)
+    return jsonify({"ok": True, "logs": logs})
+
+# --------------------
+# FAST PATH
+# --------------------
+# The drone's GET /drone/cmd poll and the deployment health check are
+# by far the most frequent requests, and after the caching work their
+# handlers are a dict read. Flask's routing + request/teardown chain
+# costs more than that, so a thin WSGI wrapper answers them directly.
+
+_FAST_HEADERS = [
+    ("Content-Type", "application/json"),
+    ("Access-Control-Allow-Origin", "*"),
+    ("Access-Control-Allow-Headers", "X-APP-TOKEN,Content-Type"),
+    ("Access-Control-Allow-Methods", "GET,POST,OPTIONS"),
+]
+_UNAUTHORIZED_BODY = b'{"ok":false,"error":"unauthorized"}'
+
+def _fast_reply(start_response, status, body):
+    start_response(status, _FAST_HEADERS + [("Content-Length", str(len(body)))])
+    return [body]
+
+def _fast_cmd(environ, start_response):
+    token = environ.get("HTTP_X_APP_TOKEN", "")
+    if not hmac.compare_digest(token.encode(), APP_TOKEN_B):
+        return _fast_reply(start_response, "401 UNAUTHORIZED", _UNAUTHORIZED_BODY)
+    cmd = _resolve_command(int(time.time()))
+    return _fast_reply(start_response, "200 OK", orjson.dumps({"ok": True, "command": cmd}))
+
+# Only the timestamp varies, so keep a byte template and splice it in
+_HEALTH_TEMPLATE = b'{"ok":true,"time":__T__}'
+
+def _fast_health(environ, start_response):
+    body = _HEALTH_TEMPLATE.replace(b"__T__", str(int(time.time())).encode())
+    return _fast_reply(start_response, "200 OK", body)
+
+class FastPath:
+    def __init__(self, wsgi):
+        self.wsgi = wsgi
+
+    def __call__(self, environ, start_response):
+        if environ.get("REQUEST_METHOD") == "GET":
+            path = environ.get("PATH_INFO")
+            if path == "/drone/cmd":
+                return _fast_cmd(environ, start_response)
+            if path == "/health":
+                return _fast_health(environ, start_response)
+        return self.wsgi(environ, start_response)
+
+app.wsgi_app = FastPath(app.wsgi_app)
+
+# Initialise at import so the app is ready when gunicorn loads
+# dronetalker:app (see gunicorn_conf.py), not just under the dev server
+init_db()
+
+if __name__ == "__main__":
+    # Dev server only — production runs gunicorn -c gunicorn_conf.py
+    # threaded=True so concurrent drone polls overlap instead of
+    # queueing behind one request; the connection pool (DB_POOL_SIZE)
+    # bounds how many of those threads can hold a DB handle at once
+    app.run(host="0.0.0.0", port=5000, threaded=True)
\ No newline at end of file
@@ -0,0 +1,15 @@
+import os
+
+# gunicorn -c gunicorn_conf.py dronetalker:app
+#
+# gthread workers: drone polling is latency-bound HTTP, so concurrency
+# comes cheap from threads. Stick to ONE worker by default — the
+# command/target caches and the long-poll event live in process memory,
+# and a second worker would not see commands posted through the first.
+bind = os.environ.get("BIND", "0.0.0.0:5000")
+workers = int(os.environ.get("WEB_WORKERS", "1"))
+worker_class = "gthread"
+threads = int(os.environ.get("WEB_THREADS", "32"))
+# Long-polls hold a connection for up to CMD_POLL_TIMEOUT (25 s)
+timeout = 60
+keepalive = 30